@@ -10,9 +10,40 @@ KOOLWOOM, PATIO BOSS, SUNDAY LIVING, PRO CHOICE, LIFEPLUS, ZAFRO, R.W.FLAME,
 COWSAR, Joy Pebble, Costway, and others.
 """
 
-import argparse
+import functools
+import os
 import sys
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Output of generate_all_codes(), built on first use (the code set is fixed)
+_ALL_CODES_CACHE = None
+
+
+def _build_byte_table(bit_0, bit_1):
+    """Map each byte value 0..255 to the Pronto tokens for its 8 bits"""
+    return {
+        b: tuple(tok for i in range(7, -1, -1) for tok in (bit_1 if (b >> i) & 1 else bit_0))
+        for b in range(256)
+    }
+
+
+def _build_byte_str_table(byte_table):
+    """Join each byte's Pronto tokens into a single space-separated string"""
+    return {b: ' '.join(tokens) for b, tokens in byte_table.items()}
+
+
+def _case_insensitive_names(speeds):
+    """Map each fan speed name and its lower-case spelling to the canonical name"""
+    names = {name.lower(): name for name in speeds}
+    names.update({name: name for name in speeds})
+    return names
+
+
 class ACIRCodeGenerator:
     """Generate Pronto IR codes for Soleus WS3-08E-201 AC control"""
     
@@ -21,6 +52,13 @@ class ACIRCodeGenerator:
     TEMP_MAX = 86
     TEMP_BASE = 0x3E  # Base value for 62°F
     
+    # Temperature byte for each supported temperature, indexed by (temp - TEMP_MIN)
+    TEMP_BYTES = tuple(range(TEMP_BASE, TEMP_BASE + TEMP_MAX - TEMP_MIN + 1))
+    
+    # Fan speed names, in display order
+    SPEEDS = ('LOW', 'MED', 'HIGH')
+    _SPEEDS_STR = ', '.join(SPEEDS)
+    
     # Fan speed bytes for temperature control mode
     FAN_SPEEDS = {
         'LOW': 0x11,
@@ -56,6 +94,15 @@ class ACIRCodeGenerator:
         'HIGH': 0x36
     }
     
+    # Fixed protocol bytes
+    DEVICE_ID = 0x19
+    PROTOCOL_BYTE2 = 0x80
+    
+    # Upper- and lower-case fan speed spellings -> canonical name
+    FAN_SPEEDS_CI = _case_insensitive_names(FAN_SPEEDS)
+    AUTO_FAN_SPEEDS_CI = _case_insensitive_names(AUTO_FAN_SPEEDS)
+    FAN_ONLY_SPEEDS_CI = _case_insensitive_names(FAN_ONLY_SPEEDS)
+    
     # Special mode values
     AUTO_TEMP_BYTE = 0x48
     FAN_ONLY_BYTE5 = 0x4F
@@ -70,14 +117,35 @@ class ACIRCodeGenerator:
     }
     DRY_BYTE5 = 0x4F  # Same as FAN only mode
     
+    # Mode -> (byte 2, fan speed bytes, byte 5); a byte 5 of None means
+    # it is derived from the temperature
+    MODE_TABLE = {
+        'TEMP': (PROTOCOL_BYTE2, FAN_SPEEDS, None),
+        'ECO': (PROTOCOL_BYTE2, ECO_SPEEDS, None),
+        'SLEEP': (SLEEP_BYTE2, SLEEP_SPEEDS, None),
+        'AUTO': (PROTOCOL_BYTE2, AUTO_FAN_SPEEDS, AUTO_TEMP_BYTE),
+        'FAN': (PROTOCOL_BYTE2, FAN_ONLY_SPEEDS, FAN_ONLY_BYTE5),
+        'DRY': (PROTOCOL_BYTE2, DRY_FAN_SPEED, DRY_BYTE5),
+        'POWER OFF': (POWER_OFF_BYTE2, {None: POWER_OFF_BYTE3}, POWER_OFF_BYTE5),  # No fan speed
+    }
+    
     # Pronto format constants
-    PRONTO_HEADER = ['0000', '006D', '004A', '0000']
-    PRONTO_CARRIER = ['0153', '00AE']
-    PRONTO_END = ['0014', '0181']
+    PRONTO_HEADER = ('0000', '006D', '004A', '0000')
+    PRONTO_CARRIER = ('0153', '00AE')
+    PRONTO_END = ('0014', '0181')
+    
+    # Pre-joined header/carrier and end tokens wrapped around every code
+    _PRONTO_PREFIX = ' '.join(PRONTO_HEADER + PRONTO_CARRIER) + ' '
+    _PRONTO_SUFFIX = ' ' + ' '.join(PRONTO_END)
     
     # Pulse/space values for binary encoding
-    BIT_0 = ['0013', '0018']  # Short pulse, short space
-    BIT_1 = ['0013', '0043']  # Short pulse, long space
+    BIT_0 = ('0013', '0018')  # Short pulse, short space
+    BIT_1 = ('0013', '0043')  # Short pulse, long space
+    
+    # Pronto tokens for every byte value, MSB first (16 tokens per byte)
+    BYTE_TO_PRONTO = _build_byte_table(BIT_0, BIT_1)
+    # The same tokens pre-joined into one string per byte value
+    BYTE_TO_PRONTO_STR = _build_byte_str_table(BYTE_TO_PRONTO)
     
     def __init__(self):
         """Initialize the generator"""
@@ -88,389 +156,269 @@ class ACIRCodeGenerator:
         if temperature < self.TEMP_MIN or temperature > self.TEMP_MAX:
             raise ValueError(f"Temperature must be between {self.TEMP_MIN} and {self.TEMP_MAX}°F")
         
-        fan_speed_upper = fan_speed.upper()
-        if fan_speed_upper not in self.FAN_SPEEDS:
-            raise ValueError(f"Fan speed must be one of: {', '.join(self.FAN_SPEEDS.keys())}")
-        
-        return fan_speed_upper
+        return self._normalize_fan_speed(fan_speed, self.FAN_SPEEDS_CI)
+    
+    def _normalize_fan_speed(self, fan_speed, speeds_ci):
+        """Map a fan speed in any case to its canonical name, or raise ValueError"""
+        name = speeds_ci.get(fan_speed)
+        if name is None:
+            # Mixed-case spellings (e.g. 'Low') miss the precomputed table
+            name = speeds_ci.get(fan_speed.upper())
+            if name is None:
+                raise ValueError(f"Fan speed must be one of: {self._SPEEDS_STR}")
+        return name
     
     def calculate_temperature_byte(self, temperature):
-        """Calculate the temperature byte value"""
+        """Calculate the temperature byte value
+        
+        Deprecated: kept for API compatibility, use TEMP_BYTES[temperature - TEMP_MIN]
+        """
         return self.TEMP_BASE + (temperature - self.TEMP_MIN)
     
-    def calculate_checksum(self, fan_byte, temp_byte):
-        """Calculate the checksum byte"""
-        return (0x80 + fan_byte + temp_byte) & 0xFF
-    
     def build_binary_data(self, temperature, fan_speed):
-        """Build the 72-bit binary data string"""
+        """Build the 9-byte payload for temperature control mode"""
         # Get byte values
         fan_byte = self.FAN_SPEEDS[fan_speed]
-        temp_byte = self.calculate_temperature_byte(temperature)
-        checksum = self.calculate_checksum(fan_byte, temp_byte)
-        
-        # Build binary string
-        binary = (
-            f"{0x19:08b}" +      # Byte 1: Device ID (0x19)
-            f"{0x80:08b}" +      # Byte 2: Protocol (0x80)
-            f"{fan_byte:08b}" +  # Byte 3: Fan speed
-            f"{0x00:08b}" +      # Byte 4: Reserved (0x00)
-            f"{temp_byte:08b}" + # Byte 5: Temperature
-            f"{0x00:08b}" +      # Byte 6: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 7: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 8: Reserved (0x00)
-            f"{checksum:08b}"    # Byte 9: Checksum
-        )
-        
-        return binary, fan_byte, temp_byte, checksum
-    
-    def binary_to_pronto(self, binary_string):
-        """Convert binary string to Pronto format"""
+        # Not range-checked here, so compute rather than index TEMP_BYTES
+        temp_byte = self.TEMP_BASE + (temperature - self.TEMP_MIN)
+        payload = self._pack(self.PROTOCOL_BYTE2, fan_byte, temp_byte)
+        checksum = payload[8]
+        
+        return payload, fan_byte, temp_byte, checksum
+    
+    def _pack(self, byte2, fan_byte, temp_byte):
+        """Pack the 9-byte payload, computing the checksum byte"""
+        return bytes((
+            self.DEVICE_ID,                         # Byte 1: Device ID (0x19)
+            byte2,                                  # Byte 2: Protocol/mode
+            fan_byte,                               # Byte 3: Fan speed
+            0x00,                                   # Byte 4: Reserved (0x00)
+            temp_byte,                              # Byte 5: Mode/Temperature
+            0x00,                                   # Byte 6: Reserved (0x00)
+            0x00,                                   # Byte 7: Reserved (0x00)
+            0x00,                                   # Byte 8: Reserved (0x00)
+            (byte2 + fan_byte + temp_byte) & 0xFF,  # Byte 9: Checksum
+        ))
+    
+    def format_binary(self, payload):
+        """Render payload bytes as a 72-bit binary string (MSB first)"""
+        return ''.join(f"{b:08b}" for b in payload)
+    
+    @classmethod
+    def binary_to_pronto(cls, payload):
+        """Convert payload bytes to Pronto format"""
         pronto_data = []
+        extend = pronto_data.extend
+        table = cls.BYTE_TO_PRONTO
         
-        for bit in binary_string:
-            if bit == '0':
-                pronto_data.extend(self.BIT_0)
-            else:  # bit == '1'
-                pronto_data.extend(self.BIT_1)
+        for b in payload:
+            extend(table[b])
         
         return pronto_data
     
-    def generate_power_off(self):
-        """Generate POWER OFF code"""
-        # Power OFF uses special values
-        byte2 = self.POWER_OFF_BYTE2
-        byte3 = self.POWER_OFF_BYTE3
-        byte5 = self.POWER_OFF_BYTE5
-        checksum = 0x62  # Fixed checksum for power off
-        
-        binary = (
-            f"{0x19:08b}" +      # Byte 1: Device ID (0x19)
-            f"{byte2:08b}" +     # Byte 2: 0x00 for power off
-            f"{byte3:08b}" +     # Byte 3: 0x13 for power off
-            f"{0x00:08b}" +      # Byte 4: Reserved (0x00)
-            f"{byte5:08b}" +     # Byte 5: 0x4F for power off
-            f"{0x00:08b}" +      # Byte 6: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 7: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 8: Reserved (0x00)
-            f"{checksum:08b}"    # Byte 9: Checksum
-        )
-        
-        pronto_data = self.binary_to_pronto(binary)
-        pronto_code = (
-            self.PRONTO_HEADER +
-            self.PRONTO_CARRIER +
-            pronto_data +
-            self.PRONTO_END
-        )
-        
-        return {
-            'pronto_code': ' '.join(pronto_code),
-            'mode': 'POWER OFF',
-            'binary': binary
+    @classmethod
+    def binary_to_pronto_str(cls, payload):
+        """Convert payload bytes to a space-separated Pronto data string"""
+        table = cls.BYTE_TO_PRONTO_STR
+        return ' '.join([table[b] for b in payload])
+    
+    @classmethod
+    @functools.lru_cache(maxsize=512)
+    def _compute_pronto(cls, payload):
+        """Build the complete Pronto code string for a packed payload (memoized)"""
+        return cls._PRONTO_PREFIX + cls.binary_to_pronto_str(payload) + cls._PRONTO_SUFFIX
+    
+    def warm_cache(self):
+        """Pre-populate the Pronto cache for every temperature/fan speed combination"""
+        for temp in range(self.TEMP_MIN, self.TEMP_MAX + 1):
+            for speed in self.SPEEDS:
+                self.generate_pronto_code(temp, speed)
+    
+    def _emit(self, mode, temperature=None, fan_speed=None, include_binary=False):
+        """Build the code and debug info for a validated mode/temperature/fan speed"""
+        byte2, fan_bytes, temp_byte = self.MODE_TABLE[mode]
+        fan_byte = fan_bytes[fan_speed]
+        if temp_byte is None:
+            temp_byte = self.TEMP_BYTES[temperature - self.TEMP_MIN]
+        payload = self._pack(byte2, fan_byte, temp_byte)
+        
+        result = {
+            'pronto_code': self._compute_pronto(payload),
+            'mode': mode
         }
+        if temperature is not None:
+            result['temperature'] = temperature
+        if fan_speed is not None:
+            result['fan_speed'] = fan_speed
+        result['byte2'] = byte2
+        result['fan_byte'] = fan_byte
+        result['temp_byte'] = temp_byte
+        result['checksum'] = payload[8]
+        if include_binary:
+            result['binary'] = self.format_binary(payload)
+        return result
+    
+    def generate_power_off(self, include_binary=False):
+        """Generate POWER OFF code"""
+        return self._emit('POWER OFF', include_binary=include_binary)
     
-    def generate_auto_mode(self, fan_speed):
+    def generate_auto_mode(self, fan_speed, include_binary=False):
         """Generate AUTO mode code"""
-        fan_speed = fan_speed.upper()
-        if fan_speed not in self.AUTO_FAN_SPEEDS:
-            raise ValueError(f"Fan speed must be one of: {', '.join(self.AUTO_FAN_SPEEDS.keys())}")
-        
-        # AUTO mode uses special fan speed bytes and fixed temp byte
-        fan_byte = self.AUTO_FAN_SPEEDS[fan_speed]
-        temp_byte = self.AUTO_TEMP_BYTE
-        checksum = (0x80 + fan_byte + temp_byte) & 0xFF
-        
-        binary = (
-            f"{0x19:08b}" +      # Byte 1: Device ID (0x19)
-            f"{0x80:08b}" +      # Byte 2: Protocol (0x80)
-            f"{fan_byte:08b}" +  # Byte 3: AUTO fan speed
-            f"{0x00:08b}" +      # Byte 4: Reserved (0x00)
-            f"{temp_byte:08b}" + # Byte 5: AUTO temp (0x48)
-            f"{0x00:08b}" +      # Byte 6: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 7: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 8: Reserved (0x00)
-            f"{checksum:08b}"    # Byte 9: Checksum
-        )
-        
-        pronto_data = self.binary_to_pronto(binary)
-        pronto_code = (
-            self.PRONTO_HEADER +
-            self.PRONTO_CARRIER +
-            pronto_data +
-            self.PRONTO_END
-        )
-        
-        return {
-            'pronto_code': ' '.join(pronto_code),
-            'mode': 'AUTO',
-            'fan_speed': fan_speed,
-            'fan_byte': fan_byte,
-            'checksum': checksum,
-            'binary': binary
-        }
+        fan_speed = self._normalize_fan_speed(fan_speed, self.AUTO_FAN_SPEEDS_CI)
+        return self._emit('AUTO', fan_speed=fan_speed, include_binary=include_binary)
     
-    def generate_fan_only_mode(self, fan_speed):
+    def generate_fan_only_mode(self, fan_speed, include_binary=False):
         """Generate FAN only mode code"""
-        fan_speed = fan_speed.upper()
-        if fan_speed not in self.FAN_ONLY_SPEEDS:
-            raise ValueError(f"Fan speed must be one of: {', '.join(self.FAN_ONLY_SPEEDS.keys())}")
-        
-        # FAN only mode uses special fan speed bytes and fixed byte5
-        fan_byte = self.FAN_ONLY_SPEEDS[fan_speed]
-        temp_byte = self.FAN_ONLY_BYTE5
-        checksum = (0x80 + fan_byte + temp_byte) & 0xFF
-        
-        binary = (
-            f"{0x19:08b}" +      # Byte 1: Device ID (0x19)
-            f"{0x80:08b}" +      # Byte 2: Protocol (0x80)
-            f"{fan_byte:08b}" +  # Byte 3: FAN only speed
-            f"{0x00:08b}" +      # Byte 4: Reserved (0x00)
-            f"{temp_byte:08b}" + # Byte 5: FAN mode (0x4F)
-            f"{0x00:08b}" +      # Byte 6: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 7: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 8: Reserved (0x00)
-            f"{checksum:08b}"    # Byte 9: Checksum
-        )
-        
-        pronto_data = self.binary_to_pronto(binary)
-        pronto_code = (
-            self.PRONTO_HEADER +
-            self.PRONTO_CARRIER +
-            pronto_data +
-            self.PRONTO_END
-        )
-        
-        return {
-            'pronto_code': ' '.join(pronto_code),
-            'mode': 'FAN',
-            'fan_speed': fan_speed,
-            'fan_byte': fan_byte,
-            'checksum': checksum,
-            'binary': binary
-        }
+        fan_speed = self._normalize_fan_speed(fan_speed, self.FAN_ONLY_SPEEDS_CI)
+        return self._emit('FAN', fan_speed=fan_speed, include_binary=include_binary)
     
-    def generate_eco_mode(self, temperature, fan_speed):
+    def generate_eco_mode(self, temperature, fan_speed, include_binary=False):
         """Generate ECO mode code"""
-        # Validate inputs
         fan_speed = self.validate_inputs(temperature, fan_speed)
-        
-        # ECO mode uses special fan speed bytes with temperature
-        fan_byte = self.ECO_SPEEDS[fan_speed]
-        temp_byte = self.calculate_temperature_byte(temperature)
-        checksum = (0x80 + fan_byte + temp_byte) & 0xFF
-        
-        binary = (
-            f"{0x19:08b}" +      # Byte 1: Device ID (0x19)
-            f"{0x80:08b}" +      # Byte 2: Protocol (0x80)
-            f"{fan_byte:08b}" +  # Byte 3: ECO fan speed
-            f"{0x00:08b}" +      # Byte 4: Reserved (0x00)
-            f"{temp_byte:08b}" + # Byte 5: Temperature
-            f"{0x00:08b}" +      # Byte 6: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 7: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 8: Reserved (0x00)
-            f"{checksum:08b}"    # Byte 9: Checksum
-        )
-        
-        pronto_data = self.binary_to_pronto(binary)
-        pronto_code = (
-            self.PRONTO_HEADER +
-            self.PRONTO_CARRIER +
-            pronto_data +
-            self.PRONTO_END
-        )
-        
-        return {
-            'pronto_code': ' '.join(pronto_code),
-            'mode': 'ECO',
-            'temperature': temperature,
-            'fan_speed': fan_speed,
-            'fan_byte': fan_byte,
-            'temp_byte': temp_byte,
-            'checksum': checksum,
-            'binary': binary
-        }
+        return self._emit('ECO', temperature, fan_speed, include_binary)
     
-    def generate_sleep_mode(self, temperature, fan_speed):
+    def generate_sleep_mode(self, temperature, fan_speed, include_binary=False):
         """Generate SLEEP mode code"""
-        # Validate inputs
         fan_speed = self.validate_inputs(temperature, fan_speed)
-        
-        # SLEEP mode uses special byte2 and fan speed bytes
-        byte2 = self.SLEEP_BYTE2
-        fan_byte = self.SLEEP_SPEEDS[fan_speed]
-        temp_byte = self.calculate_temperature_byte(temperature)
-        checksum = (byte2 + fan_byte + temp_byte) & 0xFF
-        
-        binary = (
-            f"{0x19:08b}" +      # Byte 1: Device ID (0x19)
-            f"{byte2:08b}" +     # Byte 2: SLEEP mode (0x81)
-            f"{fan_byte:08b}" +  # Byte 3: SLEEP fan speed
-            f"{0x00:08b}" +      # Byte 4: Reserved (0x00)
-            f"{temp_byte:08b}" + # Byte 5: Temperature
-            f"{0x00:08b}" +      # Byte 6: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 7: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 8: Reserved (0x00)
-            f"{checksum:08b}"    # Byte 9: Checksum
-        )
-        
-        pronto_data = self.binary_to_pronto(binary)
-        pronto_code = (
-            self.PRONTO_HEADER +
-            self.PRONTO_CARRIER +
-            pronto_data +
-            self.PRONTO_END
-        )
-        
-        return {
-            'pronto_code': ' '.join(pronto_code),
-            'mode': 'SLEEP',
-            'temperature': temperature,
-            'fan_speed': fan_speed,
-            'byte2': byte2,
-            'fan_byte': fan_byte,
-            'temp_byte': temp_byte,
-            'checksum': checksum,
-            'binary': binary
-        }
+        return self._emit('SLEEP', temperature, fan_speed, include_binary)
     
-    def generate_dry_mode(self):
+    def generate_dry_mode(self, include_binary=False):
         """Generate DRY mode code"""
         # DRY mode uses LOW fan speed only
-        fan_byte = self.DRY_FAN_SPEED['LOW']
-        temp_byte = self.DRY_BYTE5
-        checksum = (0x80 + fan_byte + temp_byte) & 0xFF
-        
-        binary = (
-            f"{0x19:08b}" +      # Byte 1: Device ID (0x19)
-            f"{0x80:08b}" +      # Byte 2: Protocol (0x80)
-            f"{fan_byte:08b}" +  # Byte 3: DRY fan speed (0x12)
-            f"{0x00:08b}" +      # Byte 4: Reserved (0x00)
-            f"{temp_byte:08b}" + # Byte 5: DRY mode (0x4F)
-            f"{0x00:08b}" +      # Byte 6: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 7: Reserved (0x00)
-            f"{0x00:08b}" +      # Byte 8: Reserved (0x00)
-            f"{checksum:08b}"    # Byte 9: Checksum
-        )
-        
-        pronto_data = self.binary_to_pronto(binary)
-        pronto_code = (
-            self.PRONTO_HEADER +
-            self.PRONTO_CARRIER +
-            pronto_data +
-            self.PRONTO_END
-        )
-        
-        return {
-            'pronto_code': ' '.join(pronto_code),
-            'mode': 'DRY',
-            'fan_speed': 'LOW',
-            'fan_byte': fan_byte,
-            'checksum': checksum,
-            'binary': binary
-        }
+        return self._emit('DRY', fan_speed='LOW', include_binary=include_binary)
     
-    def generate_pronto_code(self, temperature, fan_speed):
+    def generate_pronto_code(self, temperature, fan_speed, include_binary=False):
         """Generate complete Pronto code for given temperature and fan speed"""
-        # Validate inputs
         fan_speed = self.validate_inputs(temperature, fan_speed)
-        
-        # Build binary data
-        binary, fan_byte, temp_byte, checksum = self.build_binary_data(temperature, fan_speed)
-        
-        # Convert to Pronto format
-        pronto_data = self.binary_to_pronto(binary)
-        
-        # Build complete Pronto code
-        pronto_code = (
-            self.PRONTO_HEADER +
-            self.PRONTO_CARRIER +
-            pronto_data +
-            self.PRONTO_END
-        )
-        
-        # Return code and debug info
-        return {
-            'pronto_code': ' '.join(pronto_code),
-            'temperature': temperature,
-            'fan_speed': fan_speed,
-            'fan_byte': fan_byte,
-            'temp_byte': temp_byte,
-            'checksum': checksum,
-            'binary': binary
-        }
+        return self._emit('TEMP', temperature, fan_speed, include_binary)
     
     def generate_all_codes(self, output_file=None):
         """Generate all possible AC codes"""
-        all_codes = []
+        global _ALL_CODES_CACHE
+        if _ALL_CODES_CACHE is None:
+            _ALL_CODES_CACHE = list(self.iter_all_codes())
+        
+        if output_file:
+            if ORJSON_AVAILABLE:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(_ALL_CODES_CACHE, option=orjson.OPT_INDENT_2))
+            else:
+                import json
+                with open(output_file, 'w') as f:
+                    json.dump(_ALL_CODES_CACHE, f, indent=2)
+        
+        # Hand out copies so callers can't corrupt the cached records
+        return [dict(code) for code in _ALL_CODES_CACHE]
+    
+    def iter_all_codes(self):
+        """Yield the button record for every possible AC code"""
+        temps = range(self.TEMP_MIN, self.TEMP_MAX + 1)
+        speeds = self.SPEEDS
         
         # Temperature control codes
-        for temp in range(self.TEMP_MIN, self.TEMP_MAX + 1):
-            for speed in self.FAN_SPEEDS.keys():
-                result = self.generate_pronto_code(temp, speed)
-                all_codes.append({
+        generate = self.generate_pronto_code
+        for temp in temps:
+            for speed in speeds:
+                yield {
                     'button_name': f"AC,{temp},{speed}",
-                    'pronto_data': result['pronto_code']
-                })
+                    'pronto_data': generate(temp, speed)['pronto_code']
+                }
         
         # AUTO mode codes
-        for speed in self.AUTO_FAN_SPEEDS.keys():
-            result = self.generate_auto_mode(speed)
-            all_codes.append({
+        generate = self.generate_auto_mode
+        for speed in speeds:
+            yield {
                 'button_name': f"AUTO,{speed}",
-                'pronto_data': result['pronto_code']
-            })
+                'pronto_data': generate(speed)['pronto_code']
+            }
         
         # ECO mode codes
-        for temp in range(self.TEMP_MIN, self.TEMP_MAX + 1):
-            for speed in self.ECO_SPEEDS.keys():
-                result = self.generate_eco_mode(temp, speed)
-                all_codes.append({
+        generate = self.generate_eco_mode
+        for temp in temps:
+            for speed in speeds:
+                yield {
                     'button_name': f"ECO, {temp}, {speed}",
-                    'pronto_data': result['pronto_code']
-                })
+                    'pronto_data': generate(temp, speed)['pronto_code']
+                }
         
         # SLEEP mode codes
-        for temp in range(self.TEMP_MIN, self.TEMP_MAX + 1):
-            for speed in self.SLEEP_SPEEDS.keys():
-                result = self.generate_sleep_mode(temp, speed)
-                all_codes.append({
+        generate = self.generate_sleep_mode
+        for temp in temps:
+            for speed in speeds:
+                yield {
                     'button_name': f"SLEEP, {temp}, {speed}",
-                    'pronto_data': result['pronto_code']
-                })
+                    'pronto_data': generate(temp, speed)['pronto_code']
+                }
         
         # FAN only mode codes
-        for speed in self.FAN_ONLY_SPEEDS.keys():
-            result = self.generate_fan_only_mode(speed)
-            all_codes.append({
+        generate = self.generate_fan_only_mode
+        for speed in speeds:
+            yield {
                 'button_name': f"FAN, {speed}",
-                'pronto_data': result['pronto_code']
-            })
+                'pronto_data': generate(speed)['pronto_code']
+            }
         
         # DRY mode code
-        result = self.generate_dry_mode()
-        all_codes.append({
+        yield {
             'button_name': "DRY, AUTO",
-            'pronto_data': result['pronto_code']
-        })
+            'pronto_data': self.generate_dry_mode()['pronto_code']
+        }
         
         # POWER OFF code
-        result = self.generate_power_off()
-        all_codes.append({
+        yield {
             'button_name': "POWER OFF",
-            'pronto_data': result['pronto_code']
-        })
-        
-        if output_file:
-            import json
-            with open(output_file, 'w') as f:
-                json.dump(all_codes, f, indent=2)
-        
-        return all_codes
+            'pronto_data': self.generate_power_off()['pronto_code']
+        }
 
 
-def main():
-    """Main function for command-line usage"""
+# Set PRECACHE=1 to warm the Pronto cache for the common temperature codes at import
+if os.environ.get('PRECACHE') == '1':
+    ACIRCodeGenerator().warm_cache()
+
+
+# Static text for --info, built once from the protocol constants
+_INFO_TEXT = f"""Soleus WS3-08E-201 AC IR Protocol Information
+{"=" * 50}
+Model: Soleus Saddle Window A/C (WS3-08E-201)
+Temperature range: {ACIRCodeGenerator.TEMP_MIN}-{ACIRCodeGenerator.TEMP_MAX}°F
+Fan speeds: {ACIRCodeGenerator._SPEEDS_STR}
+
+Protocol structure (9 bytes):
+  Byte 1: Device ID (0x19)
+  Byte 2: Protocol (0x80 normal, 0x81 sleep, 0x00 power off)
+  Byte 3: Fan speed
+    - Temperature mode: LOW=0x11, MED=0x21, HIGH=0x31
+    - ECO mode: LOW=0x15, MED=0x25, HIGH=0x35
+    - SLEEP mode: LOW=0x16, MED=0x26, HIGH=0x36
+    - AUTO mode: LOW=0x10, MED=0x20, HIGH=0x30
+    - FAN only mode: LOW=0x13, MED=0x23, HIGH=0x33
+    - DRY mode: LOW=0x12 (LOW fan only)
+    - Power OFF: 0x13
+  Byte 4: Reserved (0x00)
+  Byte 5: Mode/Temperature
+    - Temperature/ECO/SLEEP mode: 0x3E + (temp - 62)
+    - AUTO mode: 0x48
+    - FAN only mode: 0x4F
+    - DRY mode: 0x4F
+    - Power OFF: 0x4F
+  Byte 6-8: Reserved (0x00)
+  Byte 9: Checksum ((byte2 + byte3 + byte5) & 0xFF)
+
+Modes:
+  - Temperature control: Set specific temperature with fan speed
+  - ECO: Energy-saving mode with temperature and fan speed
+  - SLEEP: Sleep comfort mode with temperature and fan speed
+  - AUTO: Automatic temperature control with fan speed
+  - FAN: Fan only mode (no cooling) with fan speed
+  - DRY: Dehumidification mode (LOW fan only)
+  - Power OFF: Turn off the AC unit
+"""
+
+
+def _build_parser():
+    """Build the command-line parser (argparse is only imported for CLI use)"""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='Generate Pronto IR codes for Soleus WS3-08E-201 AC control',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -504,163 +452,141 @@ Examples:
     parser.add_argument('-v', '--verbose', action='store_true',
                         help='Show detailed information')
     
+    return parser
+
+
+def main():
+    """Main function for command-line usage"""
+    parser = _build_parser()
     args = parser.parse_args()
     
     generator = ACIRCodeGenerator()
     
     # Show protocol info
     if args.info:
-        print("Soleus WS3-08E-201 AC IR Protocol Information")
-        print("=" * 50)
-        print("Model: Soleus Saddle Window A/C (WS3-08E-201)")
-        print(f"Temperature range: {generator.TEMP_MIN}-{generator.TEMP_MAX}°F")
-        print(f"Fan speeds: {', '.join(generator.FAN_SPEEDS.keys())}")
-        print("\nProtocol structure (9 bytes):")
-        print("  Byte 1: Device ID (0x19)")
-        print("  Byte 2: Protocol (0x80 normal, 0x81 sleep, 0x00 power off)")
-        print("  Byte 3: Fan speed")
-        print("    - Temperature mode: LOW=0x11, MED=0x21, HIGH=0x31")
-        print("    - ECO mode: LOW=0x15, MED=0x25, HIGH=0x35")
-        print("    - SLEEP mode: LOW=0x16, MED=0x26, HIGH=0x36")
-        print("    - AUTO mode: LOW=0x10, MED=0x20, HIGH=0x30")
-        print("    - FAN only mode: LOW=0x13, MED=0x23, HIGH=0x33")
-        print("    - DRY mode: LOW=0x12 (LOW fan only)")
-        print("    - Power OFF: 0x13")
-        print("  Byte 4: Reserved (0x00)")
-        print("  Byte 5: Mode/Temperature")
-        print("    - Temperature/ECO/SLEEP mode: 0x3E + (temp - 62)")
-        print("    - AUTO mode: 0x48")
-        print("    - FAN only mode: 0x4F")
-        print("    - DRY mode: 0x4F")
-        print("    - Power OFF: 0x4F")
-        print("  Byte 6-8: Reserved (0x00)")
-        print("  Byte 9: Checksum ((byte2 + byte3 + byte5) & 0xFF)")
-        print("\nModes:")
-        print("  - Temperature control: Set specific temperature with fan speed")
-        print("  - ECO: Energy-saving mode with temperature and fan speed")
-        print("  - SLEEP: Sleep comfort mode with temperature and fan speed")
-        print("  - AUTO: Automatic temperature control with fan speed")
-        print("  - FAN: Fan only mode (no cooling) with fan speed")
-        print("  - DRY: Dehumidification mode (LOW fan only)")
-        print("  - Power OFF: Turn off the AC unit")
+        sys.stdout.write(_INFO_TEXT)
         return
     
     # Generate all codes
     if args.all:
         print("Generating all AC codes...")
         codes = generator.generate_all_codes(args.output)
-        print(f"Generated {len(codes)} codes")
+        lines = [f"Generated {len(codes)} codes"]
         if args.output:
-            print(f"Saved to: {args.output}")
+            lines.append(f"Saved to: {args.output}")
         else:
             for code in codes[:5]:  # Show first 5 as example
-                print(f"{code['button_name']}: {code['pronto_data'][:50]}...")
-            print(f"... and {len(codes) - 5} more")
+                lines.append(f"{code['button_name']}: {code['pronto_data'][:50]}...")
+            lines.append(f"... and {len(codes) - 5} more")
+        sys.stdout.write('\n'.join(lines) + '\n')
         return
     
     # Generate single code based on mode
     if args.mode == 'off':
-        result = generator.generate_power_off()
+        result = generator.generate_power_off(include_binary=args.verbose)
         if args.verbose:
-            print("AC Code Generator - POWER OFF")
-            print("=" * 70)
-            print(f"Binary (72 bits): {result['binary']}")
-            print("\nPronto Code:")
-        print(result['pronto_code'])
+            lines = [
+                "AC Code Generator - POWER OFF",
+                "=" * 70,
+                f"Binary (72 bits): {result['binary']}",
+            ]
     
     elif args.mode == 'auto':
         if args.fan is None:
             parser.error("--fan is required for AUTO mode")
-        result = generator.generate_auto_mode(args.fan)
+        result = generator.generate_auto_mode(args.fan, include_binary=args.verbose)
         if args.verbose:
-            print(f"AC Code Generator - AUTO Mode, {result['fan_speed']} Speed")
-            print("=" * 70)
-            print(f"Fan speed byte: 0x{result['fan_byte']:02X}")
-            print(f"Checksum byte: 0x{result['checksum']:02X}")
-            print(f"Binary (72 bits): {result['binary']}")
-            print("\nPronto Code:")
-        print(result['pronto_code'])
+            lines = [
+                f"AC Code Generator - AUTO Mode, {result['fan_speed']} Speed",
+                "=" * 70,
+                f"Fan speed byte: 0x{result['fan_byte']:02X}",
+                f"Checksum byte: 0x{result['checksum']:02X}",
+                f"Binary (72 bits): {result['binary']}",
+            ]
     
     elif args.mode == 'eco':
         if args.temperature is None or args.fan is None:
             parser.error("Both --temperature and --fan are required for ECO mode")
         try:
-            result = generator.generate_eco_mode(args.temperature, args.fan)
-            if args.verbose:
-                print(f"AC Code Generator - ECO Mode, {result['temperature']}°F, {result['fan_speed']} Speed")
-                print("=" * 70)
-                print(f"Temperature byte: 0x{result['temp_byte']:02X}")
-                print(f"Fan speed byte: 0x{result['fan_byte']:02X}")
-                print(f"Checksum byte: 0x{result['checksum']:02X}")
-                print(f"Binary (72 bits): {result['binary']}")
-                print("\nPronto Code:")
-            print(result['pronto_code'])
+            result = generator.generate_eco_mode(args.temperature, args.fan, include_binary=args.verbose)
         except ValueError as e:
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
+        if args.verbose:
+            lines = [
+                f"AC Code Generator - ECO Mode, {result['temperature']}°F, {result['fan_speed']} Speed",
+                "=" * 70,
+                f"Temperature byte: 0x{result['temp_byte']:02X}",
+                f"Fan speed byte: 0x{result['fan_byte']:02X}",
+                f"Checksum byte: 0x{result['checksum']:02X}",
+                f"Binary (72 bits): {result['binary']}",
+            ]
     
     elif args.mode == 'sleep':
         if args.temperature is None or args.fan is None:
             parser.error("Both --temperature and --fan are required for SLEEP mode")
         try:
-            result = generator.generate_sleep_mode(args.temperature, args.fan)
-            if args.verbose:
-                print(f"AC Code Generator - SLEEP Mode, {result['temperature']}°F, {result['fan_speed']} Speed")
-                print("=" * 70)
-                print(f"Byte 2: 0x{result['byte2']:02X}")
-                print(f"Temperature byte: 0x{result['temp_byte']:02X}")
-                print(f"Fan speed byte: 0x{result['fan_byte']:02X}")
-                print(f"Checksum byte: 0x{result['checksum']:02X}")
-                print(f"Binary (72 bits): {result['binary']}")
-                print("\nPronto Code:")
-            print(result['pronto_code'])
+            result = generator.generate_sleep_mode(args.temperature, args.fan, include_binary=args.verbose)
         except ValueError as e:
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
+        if args.verbose:
+            lines = [
+                f"AC Code Generator - SLEEP Mode, {result['temperature']}°F, {result['fan_speed']} Speed",
+                "=" * 70,
+                f"Byte 2: 0x{result['byte2']:02X}",
+                f"Temperature byte: 0x{result['temp_byte']:02X}",
+                f"Fan speed byte: 0x{result['fan_byte']:02X}",
+                f"Checksum byte: 0x{result['checksum']:02X}",
+                f"Binary (72 bits): {result['binary']}",
+            ]
     
     elif args.mode == 'fan':
         if args.fan is None:
             parser.error("--fan is required for FAN only mode")
-        result = generator.generate_fan_only_mode(args.fan)
+        result = generator.generate_fan_only_mode(args.fan, include_binary=args.verbose)
         if args.verbose:
-            print(f"AC Code Generator - FAN Only Mode, {result['fan_speed']} Speed")
-            print("=" * 70)
-            print(f"Fan speed byte: 0x{result['fan_byte']:02X}")
-            print(f"Checksum byte: 0x{result['checksum']:02X}")
-            print(f"Binary (72 bits): {result['binary']}")
-            print("\nPronto Code:")
-        print(result['pronto_code'])
+            lines = [
+                f"AC Code Generator - FAN Only Mode, {result['fan_speed']} Speed",
+                "=" * 70,
+                f"Fan speed byte: 0x{result['fan_byte']:02X}",
+                f"Checksum byte: 0x{result['checksum']:02X}",
+                f"Binary (72 bits): {result['binary']}",
+            ]
     
     elif args.mode == 'dry':
-        result = generator.generate_dry_mode()
+        result = generator.generate_dry_mode(include_binary=args.verbose)
         if args.verbose:
-            print("AC Code Generator - DRY Mode (Dehumidification)")
-            print("=" * 70)
-            print(f"Binary (72 bits): {result['binary']}")
-            print("\nPronto Code:")
-        print(result['pronto_code'])
+            lines = [
+                "AC Code Generator - DRY Mode (Dehumidification)",
+                "=" * 70,
+                f"Binary (72 bits): {result['binary']}",
+            ]
     
     else:  # temp mode
         if args.temperature is None or args.fan is None:
             parser.error("Both --temperature and --fan are required for temperature mode")
-        
         try:
-            result = generator.generate_pronto_code(args.temperature, args.fan)
-            
-            if args.verbose:
-                print(f"AC Code Generator - {result['temperature']}°F, {result['fan_speed']} Speed")
-                print("=" * 70)
-                print(f"Temperature byte: 0x{result['temp_byte']:02X}")
-                print(f"Fan speed byte: 0x{result['fan_byte']:02X}")
-                print(f"Checksum byte: 0x{result['checksum']:02X}")
-                print(f"Binary (72 bits): {result['binary']}")
-                print("\nPronto Code:")
-            
-            print(result['pronto_code'])
-            
+            result = generator.generate_pronto_code(args.temperature, args.fan, include_binary=args.verbose)
         except ValueError as e:
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
+        if args.verbose:
+            lines = [
+                f"AC Code Generator - {result['temperature']}°F, {result['fan_speed']} Speed",
+                "=" * 70,
+                f"Temperature byte: 0x{result['temp_byte']:02X}",
+                f"Fan speed byte: 0x{result['fan_byte']:02X}",
+                f"Checksum byte: 0x{result['checksum']:02X}",
+                f"Binary (72 bits): {result['binary']}",
+            ]
+    
+    # Emit the verbose details and the code in a single write
+    if args.verbose:
+        lines += ["", "Pronto Code:", result['pronto_code']]
+        sys.stdout.write('\n'.join(lines) + '\n')
+    else:
+        sys.stdout.write(result['pronto_code'] + '\n')
 
 
 if __name__ == "__main__":
@@ -5,12 +5,18 @@ Monitors ESPHome logs via API to capture Pronto codes from dump output
 """
 
 import asyncio
+import hashlib
+import heapq
 import json
 import re
 from datetime import datetime
 from collections import deque
 import logging
+import os
+import signal
+import sys
 import time
+import traceback
 
 try:
     import aioesphomeapi
@@ -21,34 +27,84 @@ except ImportError:
 
 # Configuration
 ESP32_IP = "x.x.x.x"
-LOG_FILE = "captured_ir_buttons.json"
+LOG_FILE = "captured_ir_buttons.jsonl"  # JSON Lines: one capture per line, append-only
+LEGACY_LOG_FILE = "captured_ir_buttons.json"  # Older single-array log, read when LOG_FILE is missing
 MATCH_THRESHOLD = 10  # Need 3 matching codes to identify a button
 BUFFER_SIZE = 40     # Collect up to 20 codes before analyzing
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+log = logging.getLogger("ir_capture")  # Per-event details are DEBUG; enable with -v
+
+# Precompiled patterns used on every log line
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')  # ANSI color codes
+_HEX_PAIR_RE = re.compile(r'([0-9A-Fa-f]{4})([0-9A-Fa-f]{4})')   # Run-together hex words
+
+# remote.pronto dump tags (line 231 starts a dump, line 233 carries hex data)
+_TAG_PREFIX = "[I][remote.pronto:"
+_TAG_231_START = "[I][remote.pronto:231]: Received Pronto: data="
+_TAG_233 = "[I][remote.pronto:233]:"
+
+_NAME_PROMPT = "Enter button name (or press Enter for auto-name): "
+
+
+def _fingerprint(pronto_data):
+    """Compact 16-byte key for a (cleaned) Pronto string"""
+    return hashlib.blake2b(pronto_data.encode(), digest_size=16).digest()
+
 
 class LogBasedIRCapture:
     def __init__(self):
+        # Codes are keyed by their fingerprint (see _fingerprint)
         self.recent_codes = deque(maxlen=BUFFER_SIZE)
+        self.code_counts = {}  # Occurrences of each code in recent_codes
+        self.code_to_str = {}  # Full Pronto string for each code in recent_codes
         self.captured_buttons = []
         self.already_captured = set()  # Track codes we've already saved
         self.client = None
         self.pronto_buffer = []
         self.collecting_pronto = False
-        self.current_pronto_lines = []
+        self.current_pronto_lines = deque()  # Hex lines of the dump being collected (reused)
         self.last_code_time = 0
-        self.last_code = ""
+        self.last_code = b""
+        self._last_raw = ""  # Last accepted code as received, before cleaning
         self.debounce_time = 0.2  # Ignore repeated codes within 1 second
+        self._loop = None  # Event loop, set while monitoring
+        self._stop = None  # Set by the SIGINT handler to end monitoring
+        self._pending_names = deque()  # Matched codes waiting for a typed name
+        self._stdin_buffer = b""  # Typed input not yet split into lines
+        self._reading_names = False  # True while the event loop watches stdin for names
+        self._migrate_legacy = False  # Legacy captures not yet copied into LOG_FILE
         self.load_existing_captures()
         
     def load_existing_captures(self):
         try:
             with open(LOG_FILE, 'r') as f:
-                self.captured_buttons = json.load(f)
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    # Decode line by line so one torn append doesn't lose the rest
+                    try:
+                        self.captured_buttons.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        print(f"⚠️  Skipping unreadable line {line_number} of {LOG_FILE}")
+        except FileNotFoundError:
+            self.load_legacy_captures()
+            
+        if self.captured_buttons:
+            self.already_captured = {_fingerprint(c["pronto_data"]) for c in self.captured_buttons}
             print(f"📚 Loaded {len(self.captured_buttons)} existing captures")
-        except (FileNotFoundError, json.JSONDecodeError):
+        else:
             print("📚 Starting with empty capture log")
             
+    def load_legacy_captures(self):
+        """Read the older JSON array log; it is copied into LOG_FILE on the first save"""
+        try:
+            with open(LEGACY_LOG_FILE, 'r') as f:
+                self.captured_buttons = json.load(f)
+            self._migrate_legacy = bool(self.captured_buttons)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+            
     def save_capture(self, pronto_data, button_name=None):
         if not button_name:
             button_name = f"button_{len(self.captured_buttons) + 1}"
@@ -62,9 +118,19 @@ class LogBasedIRCapture:
         
         self.captured_buttons.append(capture)
         
+        # The first save after loading the legacy log writes its captures too
+        new_captures = self.captured_buttons if self._migrate_legacy else [capture]
+        
         try:
-            with open(LOG_FILE, 'w') as f:
-                json.dump(self.captured_buttons, f, indent=2)
+            lines = ''.join(json.dumps(c) + "\n" for c in new_captures)
+            with open(LOG_FILE, 'ab+') as f:
+                # Start on a fresh line if the last append was cut short
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        lines = "\n" + lines
+                f.write(lines.encode())
+            self._migrate_legacy = False
                 
             print(f"\n🎯 BUTTON CAPTURED!")
             print(f"Name: {button_name}")
@@ -78,100 +144,162 @@ class LogBasedIRCapture:
         if not pronto_data:
             return
             
+        # Held buttons repeat the exact same dump; catch those before cleaning
+        current_time = time.monotonic()
+        within_debounce = current_time - self.last_code_time < self.debounce_time
+        if within_debounce and pronto_data == self._last_raw:
+            log.debug("📡 Ignoring repeat within %ss", self.debounce_time)
+            return
+            
         # Clean up the Pronto data
         cleaned_data = ' '.join(pronto_data.split())
         
+        fp = _fingerprint(cleaned_data)
+        
         # Check if this is a repeat of the last code within debounce time
-        current_time = datetime.now().timestamp()
-        if (cleaned_data == self.last_code and 
-            current_time - self.last_code_time < self.debounce_time):
-            print(f"📡 Ignoring repeat within {self.debounce_time}s")
+        # (catches repeats that only differ in whitespace)
+        if within_debounce and fp == self.last_code:
+            log.debug("📡 Ignoring repeat within %ss", self.debounce_time)
             return
             
-        self.last_code = cleaned_data
+        self.last_code = fp
+        self._last_raw = pronto_data
         self.last_code_time = current_time
         
         # Skip if we've already captured this code
-        if cleaned_data in self.already_captured:
-            print(f"📡 Already captured this code, skipping...")
+        if fp in self.already_captured:
+            log.debug("📡 Already captured this code, skipping...")
             return
         
-        print(f"📡 Pronto received: {cleaned_data[:60]}...")
+        log.debug("📡 Pronto received: %.60s...", cleaned_data)
         
-        self.recent_codes.append(cleaned_data)
+        # Keep the per-code counts in step with the rolling buffer
+        code_counts = self.code_counts
+        if len(self.recent_codes) == BUFFER_SIZE:
+            evicted = self.recent_codes[0]
+            remaining = code_counts[evicted] - 1
+            if remaining:
+                code_counts[evicted] = remaining
+            else:
+                del code_counts[evicted]
+                del self.code_to_str[evicted]
+        self.recent_codes.append(fp)
+        count = code_counts.get(fp, 0) + 1
+        code_counts[fp] = count
+        self.code_to_str[fp] = cleaned_data
         
-        # Count occurrences of each unique code in the buffer
-        from collections import Counter
-        code_counts = Counter(self.recent_codes)
+        log.debug("   Buffer: %d/%d codes", len(self.recent_codes), BUFFER_SIZE)
         
-        print(f"   Buffer: {len(self.recent_codes)}/{BUFFER_SIZE} codes")
-        
-        # Check if any code has appeared at least MATCH_THRESHOLD times
-        for code, count in code_counts.items():
-            if count >= MATCH_THRESHOLD and code not in self.already_captured:
-                print(f"\n🔥 Found a code that appeared {count} times!")
-                print(f"   Code: {code[:60]}...")
-                button_name = input("Enter button name (or press Enter for auto-name): ").strip()
-                self.save_capture(code, button_name)
-                self.already_captured.add(code)
+        # Only the code just added can have reached MATCH_THRESHOLD
+        if count >= MATCH_THRESHOLD and fp not in self.already_captured:
+            print(f"\n🔥 Found a code that appeared {count} times!")
+            print(f"   Code: {cleaned_data[:60]}...")
+            self.already_captured.add(fp)
+            if self._reading_names:
+                # The name is read when stdin has a line, so log handling keeps running
+                self._pending_names.append(cleaned_data)
+                if len(self._pending_names) == 1:
+                    print(_NAME_PROMPT, end="", flush=True)
+            else:
+                self.save_capture(cleaned_data, self._prompt_button_name())
                 
         # Show status of codes in buffer
-        if len(code_counts) > 0:
+        if code_counts and log.isEnabledFor(logging.DEBUG):
             status_parts = []
-            for code, count in code_counts.most_common(5):  # Show top 5
-                preview = code[:20] + "..."
+            top_codes = heapq.nlargest(5, code_counts.items(), key=lambda item: item[1])
+            for code_fp, count in top_codes:  # Show top 5
+                preview = self.code_to_str[code_fp][:20] + "..."
                 status_parts.append(f"{count}x {preview}")
-            print(f"   Top codes: {' | '.join(status_parts)}")
+            log.debug("   Top codes: %s", ' | '.join(status_parts))
+            
+    def _prompt_button_name(self):
+        try:
+            return input(_NAME_PROMPT).strip()
+        except EOFError:
+            return ""  # No stdin to read a name from: use the auto-name
+    
+    def _start_reading_names(self):
+        """Read button names from stdin on the event loop instead of blocking in input()"""
+        try:
+            self._loop.add_reader(sys.stdin.fileno(), self._on_stdin)
+            self._reading_names = True
+        except (NotImplementedError, OSError, ValueError):
+            pass  # stdin can't be watched (Windows, regular file): fall back to input()
+            
+    def _on_stdin(self):
+        data = os.read(sys.stdin.fileno(), 1024)
+        if not data:
+            # stdin was closed, so no more names can be typed
+            self._stop_reading_names()
+            return
+            
+        self._stdin_buffer += data
+        while b"\n" in self._stdin_buffer:
+            line, self._stdin_buffer = self._stdin_buffer.split(b"\n", 1)
+            if not self._pending_names:
+                continue  # Nothing is waiting for a name
+            button_name = line.decode('utf-8', errors='ignore').strip()
+            self.save_capture(self._pending_names.popleft(), button_name)
+            if self._pending_names:
+                print(_NAME_PROMPT, end="", flush=True)
+                
+    def _stop_reading_names(self):
+        """Stop watching stdin and save codes still waiting for a name with auto-names"""
+        if self._reading_names:
+            self._loop.remove_reader(sys.stdin.fileno())
+            self._reading_names = False
+        while self._pending_names:
+            self.save_capture(self._pending_names.popleft())
             
     def parse_log_message(self, message):
         """Parse log messages for Pronto data"""
-        # Debug: print all messages to see what we're receiving
-        if "remote" in message.lower() or "pronto" in message.lower():
-            print(f"[DEBUG] IR-related message: {message}")
+        # A single scan finds the remote.pronto tag; which line it is (231/233)
+        # is then checked in place at that position
+        tag_pos = message.find(_TAG_PREFIX)
+        
+        # Any other message type ends the collection if we have data
+        if tag_pos < 0:
+            if self.collecting_pronto:
+                if self.current_pronto_lines:
+                    complete_pronto = ' '.join(self.current_pronto_lines)
+                    log.debug("Ended collection, complete Pronto: %.60s...", complete_pronto)
+                    self.process_pronto_code(complete_pronto)
+                self.collecting_pronto = False
+                self.current_pronto_lines.clear()
+            return
         
         # Check if this is the start of a Pronto dump
-        if "[I][remote.pronto:231]: Received Pronto: data=" in message:
+        if message.startswith(_TAG_231_START, tag_pos):
             # Start new collection
             self.collecting_pronto = True
-            self.current_pronto_lines = []
-            print("[DEBUG] Started collecting multi-line Pronto code")
+            self.current_pronto_lines.clear()
+            log.debug("Started collecting multi-line Pronto code")
             return
                     
         # Check if this is a data line with hex data
-        if "[I][remote.pronto:233]:" in message:
+        if message.startswith(_TAG_233, tag_pos):
             # Extract the hex data part after the tag
-            parts = message.split("[I][remote.pronto:233]:", 1)
-            if len(parts) > 1:
-                hex_data = parts[1].strip()
-                
-                # If we're collecting multi-line, add to buffer
-                if self.collecting_pronto:
-                    self.current_pronto_lines.append(hex_data)
-                    # Check if this looks like the end
-                    if "0181" in hex_data or (len(hex_data.split()) < 5 and len(self.current_pronto_lines) > 1):
-                        # Complete multi-line Pronto code received
-                        complete_pronto = ' '.join(self.current_pronto_lines)
-                        print(f"[DEBUG] Complete multi-line Pronto: {complete_pronto[:60]}...")
-                        self.process_pronto_code(complete_pronto)
-                        self.collecting_pronto = False
-                        self.current_pronto_lines = []
-                # Only check for single-line format if NOT collecting multi-line
-                elif hex_data.startswith("0000") and "0181" in hex_data:
-                    # This is a complete single-line code
-                    # Fix any missing spaces between 4-digit hex values
-                    import re
-                    fixed_hex = re.sub(r'([0-9A-Fa-f]{4})([0-9A-Fa-f]{4})', r'\1 \2', hex_data)
-                    print(f"[DEBUG] Complete single-line Pronto: {fixed_hex[:60]}...")
-                    self.process_pronto_code(fixed_hex)
-                    
-        # Any other message type ends the collection if we have data
-        elif self.collecting_pronto and "[I][remote.pronto:" not in message:
-            if self.current_pronto_lines:
-                complete_pronto = ' '.join(self.current_pronto_lines)
-                print(f"[DEBUG] Ended collection, complete Pronto: {complete_pronto[:60]}...")
-                self.process_pronto_code(complete_pronto)
-            self.collecting_pronto = False
-            self.current_pronto_lines = []
+            hex_data = message[tag_pos + len(_TAG_233):].strip()
+            
+            # If we're collecting multi-line, add to buffer
+            if self.collecting_pronto:
+                self.current_pronto_lines.append(hex_data)
+                # Check if this looks like the end: the 0181 lead-out sits in the
+                # last few words, and a short line (< 5 words) closes the dump
+                if "0181" in hex_data[-16:] or (hex_data.count(' ') < 4 and len(self.current_pronto_lines) > 1):
+                    # Complete multi-line Pronto code received
+                    complete_pronto = ' '.join(self.current_pronto_lines)
+                    log.debug("Complete multi-line Pronto: %.60s...", complete_pronto)
+                    self.process_pronto_code(complete_pronto)
+                    self.collecting_pronto = False
+                    self.current_pronto_lines.clear()
+            # Only check for single-line format if NOT collecting multi-line
+            elif hex_data.startswith("0000") and "0181" in hex_data[-16:]:
+                # This is a complete single-line code
+                # Fix any missing spaces between 4-digit hex values
+                fixed_hex = _HEX_PAIR_RE.sub(r'\1 \2', hex_data)
+                log.debug("Complete single-line Pronto: %.60s...", fixed_hex)
+                self.process_pronto_code(fixed_hex)
                 
     async def monitor_logs(self):
         """Monitor ESPHome logs for IR codes"""
@@ -183,6 +311,10 @@ class LogBasedIRCapture:
             
             print("✅ Connected to ESPHome API!")
             
+            # Button names are read from stdin by the event loop as they are typed
+            self._loop = asyncio.get_running_loop()
+            self._start_reading_names()
+            
             # Get device info
             device_info = await self.client.device_info()
             print(f"📱 Device: {device_info.name}")
@@ -195,45 +327,22 @@ class LogBasedIRCapture:
             
             # Define log callback
             def log_callback(log_entry):
-                # Debug: show what we're receiving
-                try:
-                    # The log_entry is a protobuf message, extract the message field directly
-                    message = log_entry.message
-                    
-                    # Check if message is bytes and decode it
-                    if isinstance(message, bytes):
-                        message = message.decode('utf-8', errors='ignore')
-                    
-                    # Strip ANSI color codes
-                    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-                    clean_message = ansi_escape.sub('', message)
-                    
-                    # Debug print for all messages (comment out once working)
-                    # print(f"[DEBUG] Clean message: {clean_message}")
-                    
-                    # Process IR-related messages
-                    if 'remote' in clean_message.lower() or 'pronto' in clean_message.lower():
-                        self.parse_log_message(clean_message)
-                        
-                except Exception as e:
-                    print(f"[DEBUG] Error processing log entry: {e}")
-                    # Try to process the raw string representation
-                    try:
-                        raw_str = str(log_entry)
-                        if 'remote.pronto' in raw_str:
-                            # Extract the message part
-                            if 'message: "' in raw_str:
-                                msg_start = raw_str.find('message: "') + 10
-                                msg_end = raw_str.find('"', msg_start)
-                                if msg_end > msg_start:
-                                    raw_message = raw_str[msg_start:msg_end]
-                                    # Strip ANSI codes from escaped format
-                                    raw_message = raw_message.replace('\\033[0;32m', '')
-                                    raw_message = raw_message.replace('\\033[0m', '')
-                                    raw_message = raw_message.replace('\\033[0;36m', '')
-                                    self.parse_log_message(raw_message)
-                    except Exception as e2:
-                        print(f"[DEBUG] Secondary error: {e2}")
+                # The log_entry is a protobuf message, extract the message field directly
+                message = log_entry.message
+                
+                # Check if message is bytes and decode it (errors='ignore' never raises)
+                if isinstance(message, bytes):
+                    message = message.decode('utf-8', errors='ignore')
+                
+                # Strip ANSI color codes (skip the regex when there are none)
+                clean_message = _ANSI_RE.sub('', message) if '\x1b' in message else message
+                
+                # Debug print for all messages (comment out once working)
+                # print(f"[DEBUG] Clean message: {clean_message}")
+                
+                # Process Pronto dump lines (and whatever ends a multi-line dump)
+                if self.collecting_pronto or 'remote.pronto:' in clean_message:
+                    self.parse_log_message(clean_message)
                 
             # Subscribe to logs with verbose level to catch all messages
             # LogLevel values: NONE=0, ERROR=1, WARN=2, INFO=3, DEBUG=4, VERBOSE=5, VERY_VERBOSE=6
@@ -241,20 +350,26 @@ class LogBasedIRCapture:
             self.client.subscribe_logs(log_callback, log_level=6)  # VERY_VERBOSE
             
             print("📡 Subscribed to logs successfully with VERY_VERBOSE level!")
-            print("[DEBUG] Waiting for IR messages... (press a remote button)")
+            log.debug("Waiting for IR messages... (press a remote button)")
             
-            # Keep the connection alive
+            # Keep the connection alive until Ctrl+C, without periodic wake-ups
+            self._stop = asyncio.Event()
+            try:
+                self._loop.add_signal_handler(signal.SIGINT, self._stop.set)
+            except NotImplementedError:
+                pass  # No loop signal handlers (Windows): Ctrl+C raises KeyboardInterrupt
             try:
-                while True:
-                    await asyncio.sleep(1)
+                await self._stop.wait()
+                self._stop_reading_names()
+                print(f"\n👋 Stopped. Captured {len(self.captured_buttons)} buttons.")
             except asyncio.CancelledError:
                 pass
                     
         except Exception as e:
             print(f"❌ Connection error: {e}")
-            import traceback
             traceback.print_exc()
         finally:
+            self._stop_reading_names()
             if self.client:
                 await self.client.disconnect()
             
@@ -311,7 +426,9 @@ class LogBasedIRCapture:
             print()
 
 if __name__ == "__main__":
-    import sys
+    if "-v" in sys.argv[1:]:
+        sys.argv.remove("-v")
+        log.setLevel(logging.DEBUG)
     
     if len(sys.argv) > 1:
         if sys.argv[1] == "list":
@@ -323,5 +440,6 @@ if __name__ == "__main__":
             print("  ./test.py         - Start capturing IR codes")
             print("  ./test.py list    - List all captured buttons")
             print("  ./test.py export  - Export buttons for ESPHome YAML")
+            print("  ./test.py -v      - Capture with per-code debug output")
     else:
         LogBasedIRCapture().run()